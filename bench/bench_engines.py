@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""Compare speed of tad-diff engines on wide numeric tables.
+
+Generate two tables with typed header, an integer key and many number
+columns, where a fraction of rows is changed, deleted and inserted.
+Diff them with each engine and print rows per second.
+"""
+
+import argparse
+import csv
+import os
+import os.path as path
+import random
+import subprocess
+import tempfile
+import time
+
+
+def write_table(filepath, rows, ncols):
+    with open(filepath, 'w', newline='', encoding='utf-8') as f:
+        w = csv.writer(f)
+        w.writerow(
+            ['id integer'] +
+            ['c%d number' % i for i in range(ncols)]
+        )
+        w.writerows(rows)
+
+
+def gen_tables(dir, nrows, ncols, changed):
+    rnd = random.Random(0)
+    rows1 = [
+        [str(i)] + ['%.2f' % rnd.uniform(0, 1000) for c in range(ncols)]
+        for i in range(nrows)
+    ]
+    rows2 = [list(row) for row in rows1]
+    for row in rnd.sample(rows2, int(nrows * changed)):
+        row[rnd.randrange(1, ncols + 1)] = '-1'
+    # delete some rows, insert others
+    ndeleted = int(nrows * changed / 2)
+    rows2 = rows2[ndeleted:] + [
+        [str(nrows + i)] + ['0'] * ncols
+        for i in range(ndeleted)
+    ]
+    rnd.shuffle(rows2)
+
+    files = [path.join(dir, name) for name in ['t1.csv', 't2.csv']]
+    for filepath, rows in zip(files, [rows1, rows2]):
+        write_table(filepath, rows, ncols)
+    return files
+
+
+def bench(engine, file1, file2):
+    tad_diff = path.join(path.dirname(__file__), '..', 'tad', 'tad-diff')
+    start = time.perf_counter()
+    subprocess.run(
+        [tad_diff, '-engine', engine, '-typed-header', '-key', 'id'] +
+        ['-data1', file1, '-data2', file2] +
+        # databases and tables are not queried when data files are given
+        ['db1', 'db2', 't'],
+        stdout=subprocess.DEVNULL,
+        check=True
+    )
+    return time.perf_counter() - start
+
+
+def parse_args():
+    p = argparse.ArgumentParser(description=__doc__)
+    p.add_argument('-rows', type=int, default=20000)
+    p.add_argument('-cols', type=int, default=120)
+    p.add_argument(
+        '-changed',
+        type=float,
+        default=0.01,
+        help='fraction of changed rows'
+    )
+    p.add_argument(
+        '-engines',
+        default='daff,numpy',
+        type=lambda s: s.split(',')
+    )
+    return p.parse_args()
+
+
+if __name__ == '__main__':
+    args = parse_args()
+    with tempfile.TemporaryDirectory() as dir:
+        file1, file2 = gen_tables(dir, args.rows, args.cols, args.changed)
+        print('%d rows, %d columns, %.1f%% changed' % (
+            args.rows,
+            args.cols + 1,
+            100 * args.changed
+        ))
+        for engine in args.engines:
+            secs = bench(engine, file1, file2)
+            print('%-6s %8.2f s %12.0f rows/s' % (
+                engine,
+                secs,
+                args.rows / secs
+            ))
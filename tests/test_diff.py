@@ -6,7 +6,7 @@ import shutil
 
 import pytest
 
-from testutil import run
+from testutil import run, RunError
 
 
 DBPATH = 'vfpdb/db.dbc'
@@ -25,7 +25,8 @@ def diff(
         table1,
         table2=None,
         typed_header=False,
-        key=None
+        key=None,
+        engine=None
     ):
     """Diff two tables and return captured diff parsed with csv.
 
@@ -33,12 +34,15 @@ def diff(
   
     If not None, key must be a string of comma-separated column names
     to use as key when comparing.
+
+    If not None, engine is a diff engine to use.
     """
     dbname = path.basename(DBPATH)
     cmd = (
         ['tad-diff'] +
         (['-typed-header'] if typed_header else []) +
         (['-key', key] if key else []) +
+        (['-engine', engine] if engine else []) +
         [path.join(dbdir, dbname) for dbdir in [db1dir, db2dir]] +
         [table1] +
         ([table2] if table2 else [])
@@ -146,3 +150,144 @@ def test_diff_with_key_and_typed_header(tmpdb):
         ['+++', 'john', '456', 'tester'],
         ['---', 'john', '123', 'dev']
     ]
+
+
+def test_numpy_engine(tmpdb):
+    pytest.importorskip('numpy')
+    assert diff(
+        'db2',
+        'db2',
+        "select 1 id, 'john' name, 10 age from full",
+        "select 1 id, 'john' name, 20 age from full"
+        " union select 2 id, 'bill' name, 30 age from full",
+        typed_header=True,
+        key='id',
+        engine='numpy'
+    )[1:] == [
+        ['->', '1.0', 'john', '10.0->20.0'],
+        ['+++', '2.0', 'bill', '30.0']
+    ]
+
+
+def test_numpy_engine_rejects_duplicate_keys(tmpdb):
+    pytest.importorskip('numpy')
+    with pytest.raises(RunError) as excinfo:
+        diff(
+            'db2',
+            'db2',
+            "select 1 id, 'a' name, 1 v from full"
+            " union select 1 id, 'b' name, 2 v from full",
+            "select 1 id, 'a' name, 1 v from full"
+            " union select 1 id, 'z' name, 9 v from full",
+            key='id',
+            engine='numpy'
+        )
+    assert excinfo.value.returncode == 1
+    excinfo.match('numpy engine requires unique keys')
+
+
+def test_numpy_engine_exact_numbers(tmpdb):
+    pytest.importorskip('numpy')
+    with open('data1.csv', 'w') as f:
+        f.write('id integer,n number,c currency\n')
+        f.write('99999999999999999999,12345678901234567,900000000000000.1234\n')
+    with open('data2.csv', 'w') as f:
+        f.write('id integer,n number,c currency\n')
+        f.write('99999999999999999999,12345678901234568,900000000000000.1235\n')
+    out, err = run(
+        ['tad-diff', '-typed-header', '-key', 'id', '-engine', 'numpy'] +
+        ['-data1', 'data1.csv', '-data2', 'data2.csv'] +
+        ['db2/db.dbc', 'db2/db.dbc', 'full']
+    )
+    assert list(csv.reader(StringIO(out)))[1:] == [[
+        '->',
+        '99999999999999999999',
+        '12345678901234567->12345678901234568',
+        '900000000000000.1234->900000000000000.1235'
+    ]]
+
+
+def test_check_equal_tables(tmpdb):
+    out, err = run(['tad-diff', '-check', 'db2/db.dbc', 'db2/db.dbc', 'full'])
+    assert out.startswith('equal')
+
+
+def test_check_different_tables(tmpdb):
+    with pytest.raises(RunError) as excinfo:
+        run(['tad-diff', '-check', 'db1/db.dbc', 'db2/db.dbc', 'full'])
+    assert excinfo.value.returncode == 1
+    assert excinfo.value.output.startswith('different')
+
+
+def test_check_fetch_error(tmpdb):
+    with pytest.raises(RunError) as excinfo:
+        run(
+            ['tad-diff', '-check', 'db1/db.dbc', 'db2/db.dbc'] +
+            ['select * from nosuchtable']
+        )
+    # not 1, which means tables are different
+    assert excinfo.value.returncode == 2
+
+
+def test_check_with_saved_fingerprint(tmpdb):
+    out, err = run(['tad-diff', '-fingerprint', 'db2/db.dbc', 'db2/db.dbc', 'full'])
+    with open('fingerprint.json', 'w') as f:
+        f.write(out)
+    # second table is taken from fingerprint, not from db1
+    out, err = run(
+        ['tad-diff', '-check', '-fingerprint2', 'fingerprint.json'] +
+        ['db2/db.dbc', 'db1/db.dbc', 'full']
+    )
+    assert out.startswith('equal')
+
+
+def test_diff_selected_columns(tmpdb):
+    out, err = run(
+        ['tad-diff', '-key', 'id', '-columns', 'name'] +
+        ['db1/db.dbc', 'db2/db.dbc', 'full']
+    )
+    # key column is always fetched
+    assert list(csv.reader(StringIO(out))) == [
+        ['@@', 'id', 'name'],
+        ['+++', '1', 'john']
+    ]
+
+
+def test_scratch_dir_is_cleaned(tmpdb):
+    os.mkdir('scratch')
+    out, err = run(
+        ['tad-diff', '-scratch-dir', 'scratch'] +
+        ['db1/db.dbc', 'db2/db.dbc', 'full']
+    )
+    assert list(csv.reader(StringIO(out))) == [
+        ['@@', 'id', 'name'],
+        ['+++', '1', 'john']
+    ]
+    assert os.listdir('scratch') == []
+
+
+@pytest.mark.parametrize('compression', ['gzip', 'lzma', 'none'])
+def test_diff_spilled_data(compression, tmpdb):
+    os.mkdir('scratch')
+    # spill even small data sets to disk
+    out, err = run(
+        ['tad-diff', '-scratch-dir', 'scratch', '-mem-limit', '0'] +
+        ['-compress', compression, 'db1/db.dbc', 'db2/db.dbc', 'full']
+    )
+    assert list(csv.reader(StringIO(out))) == [
+        ['@@', 'id', 'name'],
+        ['+++', '1', 'john']
+    ]
+    assert os.listdir('scratch') == []
+
+
+def test_scratch_budget_exceeded(tmpdb):
+    os.mkdir('scratch')
+    with pytest.raises(RunError) as excinfo:
+        run(
+            ['tad-diff', '-scratch-dir', 'scratch', '-mem-limit', '0'] +
+            ['-scratch-budget', '1'] +
+            ['db1/db.dbc', 'db2/db.dbc', 'full']
+        )
+    excinfo.match('budget of 1 bytes exceeded')
+    assert os.listdir('scratch') == []
@@ -5,6 +5,7 @@
 import csv
 from io import StringIO
 import os
+import random
 
 import pytest
 
@@ -18,7 +19,16 @@ os.environ['PATH'] = (
 )
 
 
-def convert(input_rows, typed_header=False, delimiter='\t', key=None):
+def convert(
+        input_rows,
+        typed_header=False,
+        delimiter='\t',
+        key=None,
+        jobs=None,
+        chunk_size=None,
+        columns=None,
+        ignored_columns=None
+    ):
     """Convert diff rows to SQL statements with diff2sql.
 
     If typed_header is True, tell diff2sql that input has typed
@@ -30,6 +40,12 @@ def convert(input_rows, typed_header=False, delimiter='\t', key=None):
 
     If not None, key must be a string of comma-separated column names
     to use as key when building queries.
+
+    If not None, jobs is a number of processes to convert input with
+    and chunk_size is a size of input chunk converted by one process.
+
+    If not None, columns and ignored_columns must be strings of
+    comma-separated column names to use and not to use in queries.
     """
     csvargs = {'delimiter': delimiter} if delimiter else {}
     delimiter_arg = ['-t'] if delimiter == '\t' else []
@@ -42,6 +58,10 @@ def convert(input_rows, typed_header=False, delimiter='\t', key=None):
         ['tad-diff2sql'] +
         (['-typed-header'] if typed_header else []) +
         (['-key', key] if key else []) +
+        (['-jobs', str(jobs)] if jobs else []) +
+        (['-chunk-size', str(chunk_size)] if chunk_size else []) +
+        (['-columns', columns] if columns else []) +
+        (['-ignore-columns', ignored_columns] if ignored_columns else []) +
         delimiter_arg +
         ['t']
     )
@@ -290,3 +310,124 @@ def test_group_updates_to_same_columns():
         ['mark', '2'],
         ['jack', '4']
     ]
+
+
+@pytest.mark.parametrize('chunk_size', [1, 5, 16, 1024])
+def test_parallel_conversion(chunk_size):
+    # small chunks make quoted fields with \r\n straddle chunk edges
+    in_rows = [
+        ['@@', 'id', 'text'],
+        ['+++', '1', 'a\r\nb'],
+        ['---', '2', '"quoted"\r\n'],
+        ['->', '3', 'x\r\n->y'],
+        ['+++', '4', 'c'],
+        ['->', '5', 'z->\r\nw'],
+    ]
+    assert convert(in_rows, jobs=2, chunk_size=chunk_size) == convert(
+        in_rows
+    ) == [
+        ['insert into t (id, text) values (?, ?)'],
+        ['id', 'text'],
+        ['1', 'a\r\nb'],
+        ['4', 'c'],
+        [],
+        ['delete from t where id = ? and text = ?'],
+        ['id', 'text'],
+        ['2', '"quoted"\r\n'],
+        [],
+        ['update t set text = ? where id = ? and text = ?'],
+        ['text', 'id', 'text'],
+        ['y', '3', 'x\r\n'],
+        ['\r\nw', '5', 'z']
+    ]
+
+
+def test_parallel_conversion_of_quote_in_unquoted_field():
+    """Quote in unquoted field breaks splitting, serial is used instead."""
+    input = '@@\tid\tname\n+++\t5"\tx\n+++\t"a\nb"\ty\n'
+    cmd = ['tad-diff2sql', '-t', '-jobs', '2', '-chunk-size', '4', 't']
+    out, err = run(cmd, input)
+    assert list(csv.reader(StringIO(out), delimiter='\t')) == [
+        ['insert into t (id, name) values (?, ?)'],
+        ['id', 'name'],
+        ['5"', 'x'],
+        ['a\nb', 'y']
+    ]
+
+
+def test_parallel_conversion_fuzz():
+    """Random diffs are converted the same way whatever -jobs is.
+
+    Some diffs have quote in unquoted field, which breaks splitting of
+    input into chunks, so conversion must fall back to serial.
+    """
+    rnd = random.Random(0)
+    field = lambda: ''.join(
+        rnd.choice(['a', '"', '\n', ',']) for i in range(rnd.randrange(5))
+    )
+    for n in range(15):
+        rows = [['@@', 'id', 'v']]
+        for i in range(rnd.randrange(1, 12)):
+            action = rnd.choice(['+++', '---', '->'])
+            value = field()
+            if action == '->':
+                value += '->' + field()
+            rows.append([action, str(i), value])
+        f = StringIO()
+        csv.writer(f).writerows(rows)
+        input = f.getvalue()
+        if rnd.random() < 0.7:
+            input = input.replace('+++,', '+++,5"', 1)
+
+        expected, err = run(['tad-diff2sql', 't'], input)
+        for chunk_size in [1, 7, 40]:
+            out, err = run(
+                ['tad-diff2sql', '-jobs', '3'] +
+                ['-chunk-size', str(chunk_size), 't'],
+                input
+            )
+            assert out == expected
+
+
+def test_ignore_columns():
+    assert convert(
+        [
+            ['@@', 'id', 'name', 'memo'],
+            ['+++', '1', 'john', 'long text'],
+            ['->', '2', 'bill', 'old->new'],
+            ['->', '3', 'sam->pat', 'text']
+        ],
+        key='id',
+        ignored_columns='memo'
+    ) == [
+        ['insert into t (id, name) values (?, ?)'],
+        ['id', 'name'],
+        ['1', 'john'],
+        [],
+        ['update t set name = ? where id = ?'],
+        ['name', 'id'],
+        ['pat', '3']
+    ]
+
+
+def test_select_columns_keeps_key():
+    assert convert(
+        [
+            ['@@', 'id', 'name', 'memo'],
+            ['->', '1', 'sam->pat', 'old->new']
+        ],
+        key='id',
+        columns='name'
+    ) == [
+        ['update t set name = ? where id = ?'],
+        ['name', 'id'],
+        ['pat', '1']
+    ]
+
+
+@pytest.mark.parametrize('option', ['-columns', '-ignore-columns'])
+def test_column_options_require_key(option):
+    with pytest.raises(RunError) as excinfo:
+        run(['tad-diff2sql', option, 'name', 't'], '@@,id,name\r\n')
+    assert excinfo.value.returncode == 2
+    excinfo.match('require -key')
@@ -0,0 +1,97 @@
+import csv
+from io import StringIO
+import json
+import os
+import os.path as path
+import shutil
+
+import pytest
+
+from testutil import run
+
+
+DBPATH = 'vfpdb/db.dbc'
+
+
+# add path to tad-fetch to PATH
+rootdir = pytest.config.rootdir
+os.environ['PATH'] = (
+    str(rootdir.join('tad')) + ':' + os.environ['PATH']
+)
+
+
+def fetch(table, typed_header=False, columns=None, ignored_columns=None):
+    """Fetch table with tad-fetch and return rows parsed with csv.
+
+    If typed_header is True, tad-fetch must return typed header.
+
+    If not None, columns and ignored_columns must be strings of
+    comma-separated column names to fetch and not to fetch.
+    """
+    cmd = (
+        ['tad-fetch'] +
+        (['-typed-header'] if typed_header else []) +
+        (['-columns', columns] if columns else []) +
+        (['-ignore-columns', ignored_columns] if ignored_columns else []) +
+        [DBPATH, table]
+    )
+    out, err = run(cmd)
+    return list(csv.reader(StringIO(out)))
+
+
+@pytest.mark.parametrize(
+    'testid,table',
+    [
+        ('table', 'full'),
+        ('query', 'select * from full')
+    ]
+)
+def test_fetch(testid, table):
+    assert fetch(table) == [
+        ['id', 'name'],
+        ['1', 'john']
+    ]
+
+
+def test_output_typed_header():
+    assert fetch('full', typed_header=True) == [
+        ['id integer', 'name string'],
+        ['1', 'john']
+    ]
+
+
+def test_output_crlf():
+    assert fetch("select chr(13) + chr(10) as text from full") == [
+        ['text'],
+        ['\r\n']
+    ]
+
+
+def test_fetch_columns():
+    assert fetch('full', columns='name') == [['name'], ['john']]
+
+
+def test_fetch_ignore_columns():
+    assert fetch('full', ignored_columns='name') == [['id'], ['1']]
+
+
+def test_metadata_cache(tmpdir, monkeypatch):
+    monkeypatch.setenv('TAD_CACHE_DIR', str(tmpdir.join('cache')))
+    shutil.copytree(path.dirname(DBPATH), tmpdir.join('db'))
+    with tmpdir.as_cwd():
+        db = path.join('db', path.basename(DBPATH))
+        run(['tad-fetch', '-key', 'id', db, 'full'])
+        out, err = run(['tad-fetch', '-meta', db, 'full'])
+    assert json.loads(out) == {
+        'columns': ['id integer', 'name string'],
+        'keys': ['id'],
+        'rows': 1
+    }
+    assert len(tmpdir.join('cache').listdir()) == 1
+
+
+def test_unwritable_metadata_cache(tmpdir, monkeypatch):
+    # cache dir path is a file, so cache can't be written
+    tmpdir.join('cache').write('')
+    monkeypatch.setenv('TAD_CACHE_DIR', str(tmpdir.join('cache')))
+    assert fetch('full', ignored_columns='name') == [['id'], ['1']]
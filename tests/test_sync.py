@@ -6,7 +6,7 @@ import shutil
 
 import pytest
 
-from testutil import run, adosql
+from testutil import run, adosql, RunError
 
 
 DBPATH = 'vfpdb/db.dbc'
@@ -123,3 +123,50 @@ def test_use_table_key(tmpdbs):
         adosql(destdb, 'select * from full')[1:] ==
         [['1', 'john']]
     )
+
+
+def test_sync_many_destinations(tmpdbs):
+    srcdb, destdb = tmpdbs
+    shutil.copytree(path.dirname(destdb), 'dest2')
+    destdb2 = path.join('dest2', path.basename(destdb))
+
+    run(['tad-sync', srcdb, destdb, destdb2, 'full', 'full'])
+    assert (
+        adosql(destdb, 'select * from full')[1:] ==
+        adosql(destdb2, 'select * from full')[1:] ==
+        [['1', 'john']]
+    )
+
+
+def test_sync_scratch_budget_exceeded(tmpdbs):
+    srcdb, destdb = tmpdbs
+    os.mkdir('scratch')
+    with pytest.raises(RunError) as excinfo:
+        run(
+            ['tad-sync', '-scratch-dir', 'scratch', '-scratch-budget', '1'] +
+            [srcdb, destdb, 'full']
+        )
+    excinfo.match('budget of 1 bytes exceeded')
+    assert os.listdir('scratch') == []
+    assert adosql(destdb, 'select * from full')[1:] == []
+
+
+def test_sync_columns_skips_equal_tables(tmpdbs, tmpdir, monkeypatch):
+    srcdb, destdb = tmpdbs
+    sync(srcdb, destdb, 'full')
+    # tables are equal now, so patching must be skipped, fail if not
+    tmpdir.join('bin').ensure(dir=True)
+    patch = tmpdir.join('bin', 'tad-patch')
+    patch.write('#!/bin/sh\nexit 1\n')
+    patch.chmod(0o755)
+    monkeypatch.setenv(
+        'PATH',
+        str(tmpdir.join('bin')) + ':' + os.environ['PATH']
+    )
+    run(['tad-sync', '-key', 'id', '-columns', 'name', srcdb, destdb, 'full'])
+
+
+def test_sync_reports_diff_failure(tmpdbs):
+    srcdb, destdb = tmpdbs
+    with pytest.raises(RunError):
+        run(['tad-sync', srcdb, destdb, 'full', 'nosuchtable'])